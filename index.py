@@ -1,40 +1,334 @@
+import asyncio
+import atexit
+import bisect
+import calendar
+import hashlib
 import json
+import mmap
 import os
-from datetime import datetime
-from typing import List, Optional
+import re
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import httpx
 import openai
 from dotenv import load_dotenv
 import os
 
 load_dotenv() 
 openai.api_key = os.getenv("OPENAI_API_KEY")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import h2  # noqa: F401  (httpx needs it to negotiate HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# httpx drops idle connections after 5s by default, which is shorter than the time
+# spent reading one AI response before asking for the next
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=20, keepalive_expiry=60.0)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+# A non-streamed bulk reply of up to 4096 tokens can take well over a minute
+BULK_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+
+# Shared by every OpenAI client so repeated requests reuse pooled connections
+SHARED_HTTPX = httpx.Client(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+atexit.register(SHARED_HTTPX.close)
+
+
+# Dates are stored and compared as strings, so only the canonical form is
+# allowed (Python 3.11+ fromisoformat also accepts forms like 20250805)
+_DATE_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+
+
+def is_iso_date(date_str: str) -> bool:
+    """Check for a real YYYY-MM-DD date without raising on bad input."""
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return False
+    year, month, day = map(int, match.groups())
+    return year >= 1 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
+
+
+def parse_iso_date(date_str: str) -> date:
+    """Parse a strict YYYY-MM-DD date string, raising ValueError otherwise."""
+    if not is_iso_date(date_str):
+        raise ValueError(f"Invalid isoformat string: {date_str!r}")
+    return date.fromisoformat(date_str)
+
+
+def _json_dumps(data, pretty: bool = False, default=None) -> bytes:
+    """Serialize data to UTF-8 JSON, using orjson when it is installed.
+    
+    ``default`` converts objects the encoder does not know, as in json.dumps.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=default).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=default).encode("utf-8")
+
+
+def _json_loads(raw):
+    """Parse JSON from a str, UTF-8 bytes or a memoryview, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()
+    return json.loads(raw)
+
+
+# Files below this size are read in one call; mapping them costs more than it saves
+MMAP_THRESHOLD = 1 << 20
+
+
+def _parse_file(path: str, parse):
+    """Run parse over the whole file at path, memory-mapping large files."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return parse(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return parse(view)
+
+
+def _load_json_file(path: str):
+    """Parse a JSON file from a single read, or a memory map for large files."""
+    return _parse_file(path, _json_loads)
+
+
+def _atomic_write(path: str, chunks: Iterable[bytes]):
+    """Write chunks to a temp file, fsync it and rename it over path.
+    
+    A crash part-way through leaves the previous file intact instead of a
+    truncated one.
+    """
+    tmp = path + ".tmp"
+    try:
+        # Keep the existing file's permissions, since the temp file replaces it
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        # A 1 MiB buffer coalesces the small chunks into one write() for typical files
+        with open(fd, 'wb', buffering=1 << 20) as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+ITINERARY_PROMPT = """
+Create a detailed daily travel itinerary for {city}, {country}
+from {start_date} to {end_date}.
+Budget: ${budget} USD.
+Preferred Activities: {activities_str}.
+
+Please provide:
+1. Day-by-day schedule
+2. Estimated costs for major activities
+3. Restaurant recommendations
+4. Transportation tips
+5. Must-see attractions
+
+Format the response in a clear, organized manner.
+"""
+
+BUDGET_TIPS_PROMPT = """
+Provide money-saving tips and budget advice for traveling to {city}, {country}.
+Budget: ${budget} USD.
+Activities: {activities_str}.
+
+Include:
+1. Budget-friendly accommodation options
+2. Cheap local food recommendations
+3. Free or low-cost activities
+4. Transportation savings
+5. General money-saving tips for this destination
+
+Keep it practical and specific to this location.
+"""
+
+BULK_ITINERARY_PROMPT = """
+Create a detailed daily travel itinerary for each of the trips below.
+For every trip provide a day-by-day schedule, estimated costs for major activities,
+restaurant recommendations, transportation tips and must-see attractions.
+
+Respond with a JSON object that maps each trip number to its itinerary as a single
+formatted text string, for example {{"1": "...", "2": "..."}}.
+
+{trips}
+"""
+
+BULK_TRIP_LINE = (
+    "Trip {number}: {city}, {country} from {start_date} to {end_date}. "
+    "Budget: ${budget} USD. Preferred Activities: {activities_str}."
+)
+
+# Shown in place of AI output when no API key is configured
+FALLBACK_ITINERARY = """
+🚫 AI Features Unavailable - Basic Itinerary Template
+
+📍 {city}, {country}
+📅 {start_date} to {end_date} ({days} days)
+💰 Budget: ${budget}
+🎯 Activities: {activities_str}
+
+📋 SUGGESTED DAILY STRUCTURE:
+========================================
+
+Day 1: Arrival & City Orientation
+- Check into accommodation
+- Explore nearby area
+- Local restaurant for dinner
+
+Day 2-{last_full_day}: Main Activities
+- Morning: {morning}
+- Afternoon: {afternoon}
+- Evening: Local cuisine and culture
+
+Day {days}: Departure
+- Last-minute shopping/activities
+- Check out and travel home
+
+💡 GENERAL TIPS:
+- Research local transportation options
+- Book accommodations in advance
+- Try local street food
+- Visit tourist information centers
+- Keep emergency contacts handy
+
+⚠️  For detailed, personalized itineraries, please set up your OpenAI API key.
+"""
+
+FALLBACK_BUDGET_TIPS = """
+🚫 AI Features Unavailable - General Budget Tips
+
+💰 BUDGET TIPS FOR {city_upper}
+========================================
+
+🏠 ACCOMMODATION:
+- Consider hostels or budget hotels
+- Look for accommodations outside city center
+- Book in advance for better rates
+- Check for group discounts
+
+🍽️ FOOD & DINING:
+- Eat at local markets and street food stalls
+- Cook meals if accommodation has kitchen
+- Look for lunch specials and happy hours
+- Avoid touristy restaurant areas
+
+🚌 TRANSPORTATION:
+- Use public transport instead of taxis
+- Walk or rent bicycles when possible
+- Look for day passes or tourist cards
+- Book flights/trains in advance
+
+🎯 ACTIVITIES:
+- Look for free walking tours
+- Visit free museums on designated days
+- Enjoy parks and natural attractions
+- Check for student/senior discounts
+
+💡 GENERAL MONEY-SAVING TIPS:
+- Set a daily spending limit
+- Use budget tracking apps
+- Avoid currency exchange at airports
+- Negotiate prices at local markets
+- Travel during off-peak seasons
+
+⚠️  For location-specific budget advice, please set up your OpenAI API key.
+"""
+
+
+@dataclass(slots=True, eq=False)
 class Destination:
     """Represents a travel destination with all necessary details."""
     
-    def __init__(self, city: str, country: str, start_date: str, end_date: str, budget: float, activities: List[str]):
-        self.city = city
-        self.country = country
-        self.start_date = start_date
-        self.end_date = end_date
-        self.budget = budget
-        self.activities = activities
+    FIELDS = ('city', 'country', 'start_date', 'end_date', 'budget', 'activities')
+    _SEP = '-' * 50
+    
+    city: str
+    country: str
+    start_date: str
+    end_date: str
+    budget: float
+    activities: List[str]
+    # Derived strings, built on first use; orjson skips underscore fields when encoding
+    _activities_str: Optional[str] = field(default=None, init=False, repr=False)
+    _search_blob: Optional[str] = field(default=None, init=False, repr=False)
+    
+    @property
+    def activities_str(self) -> str:
+        """Comma-separated activities, joined once and reused until they change."""
+        if self._activities_str is None:
+            self._activities_str = ", ".join(self.activities)
+        return self._activities_str
+    
+    @property
+    def search_blob(self) -> str:
+        """Lowercased city, country and activities for one substring test per query.
+        
+        Fields are separated by NUL so a query cannot match across two of them.
+        """
+        if self._search_blob is None:
+            self._search_blob = "\0".join([self.city, self.country, *self.activities]).lower()
+        return self._search_blob
+    
+    @property
+    def num_days(self) -> int:
+        """Trip length in days, counting both the start and end date."""
+        return (parse_iso_date(self.end_date) - parse_iso_date(self.start_date)).days + 1
     
     def update_details(self, **kwargs):
         """Update destination details with provided keyword arguments."""
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            # Only the stored fields; slots also cover private caches, and
+            # properties such as activities_str cannot be assigned
+            if key in self.FIELDS:
                 setattr(self, key, value)
+        if 'activities' in kwargs:
+            self._activities_str = None
+        if kwargs.keys() & {'city', 'country', 'activities'}:
+            self._search_blob = None
+    
+    def prompt_fields(self) -> dict:
+        """Return the values used to fill the AI prompt templates."""
+        fields = self.to_dict()
+        fields['activities_str'] = self.activities_str
+        return fields
     
     def __str__(self):
         """Return a formatted string representation of the destination."""
-        activities_str = ", ".join(self.activities)
         return f"""
 City: {self.city}
 Country: {self.country}
 Travel Dates: {self.start_date} to {self.end_date}
 Budget: ${self.budget:.2f}
-Activities: {activities_str}
-{'-' * 50}"""
+Activities: {self.activities_str}
+{self._SEP}"""
     
     def to_dict(self):
         """Convert destination to dictionary for JSON serialization."""
@@ -60,77 +354,145 @@ Activities: {activities_str}
         )
 
 
+# C-level sort keys, shared by every sort instead of being rebuilt per call
+BY_START_DATE = attrgetter('start_date')
+BY_BUDGET = attrgetter('budget')
+
+
 class ItineraryManager:
     """Manages all destination objects and file operations."""
     
     def __init__(self, filename: str = "itinerary.json"):
         self.destinations: List[Destination] = []
+        # Lowercased city -> destinations with that city, in list order
+        self._by_city: Dict[str, List[Destination]] = {}
+        # Key the list is currently sorted by, kept on add and update; None for insertion order
+        self._sort_key: Optional[Callable[[Destination], object]] = None
         self.filename = filename
+        # Compact binary copy of the itinerary, used for faster loads when msgpack is installed
+        self.msgpack_filename = os.path.splitext(filename)[0] + ".msgpack"
         self.load_from_file()
     
+    def _rebuild_index(self):
+        """Recompute the city index after destinations are loaded or reordered."""
+        self._by_city = {}
+        for dest in self.destinations:
+            self._by_city.setdefault(dest.city.lower(), []).append(dest)
+    
+    def _find_by_city(self, city: str) -> Optional[Destination]:
+        """Return the first destination with the given city (case-insensitive)."""
+        matches = self._by_city.get(city.lower())
+        return matches[0] if matches else None
+    
+    def has_destination(self, city: str) -> bool:
+        """Check whether any destination has the given city (case-insensitive)."""
+        return city.lower() in self._by_city
+    
     def add_destination(self, destination: Destination):
         """Add a new destination to the itinerary."""
-        self.destinations.append(destination)
+        self._insert(destination)
         print(f"✅ Added {destination.city}, {destination.country} to your itinerary!")
     
+    def _insert(self, destination: Destination):
+        """Add a destination to the list and city index, keeping any sort order."""
+        bucket = self._by_city.setdefault(destination.city.lower(), [])
+        if self._sort_key is None:
+            self.destinations.append(destination)
+            bucket.append(destination)
+        else:
+            # A city's bucket is a subsequence of the sorted list, so the same
+            # insertion point rule keeps both in step
+            bisect.insort(self.destinations, destination, key=self._sort_key)
+            bisect.insort(bucket, destination, key=self._sort_key)
+    
     def remove_destination(self, city: str) -> bool:
         """Remove a destination by city name."""
-        for i, dest in enumerate(self.destinations):
-            if dest.city.lower() == city.lower():
-                removed = self.destinations.pop(i)
-                print(f"✅ Removed {removed.city}, {removed.country} from your itinerary!")
-                return True
-        print(f"❌ Destination '{city}' not found!")
-        return False
+        key = city.lower()
+        matches = self._by_city.get(key)
+        if not matches:
+            print(f"❌ Destination '{city}' not found!")
+            return False
+        
+        # Drop just this entry from the index rather than rebuilding it
+        removed = matches.pop(0)
+        if not matches:
+            del self._by_city[key]
+        self.destinations.remove(removed)
+        print(f"✅ Removed {removed.city}, {removed.country} from your itinerary!")
+        return True
+    
+    def remove_many(self, cities: Iterable[str]) -> int:
+        """Remove the first destination in each given city, in one pass over the list.
+        
+        Follows the same rule as remove_destination; naming a city twice removes
+        its first two trips. Returns the number of destinations removed.
+        """
+        removed = set()
+        for city in cities:
+            key = city.lower()
+            matches = self._by_city.get(key)
+            if not matches:
+                print(f"❌ Destination '{city}' not found!")
+                continue
+            removed.add(id(matches.pop(0)))
+            if not matches:
+                del self._by_city[key]
+        
+        if not removed:
+            return 0
+        
+        self.destinations = [dest for dest in self.destinations if id(dest) not in removed]
+        noun = "destination" if len(removed) == 1 else "destinations"
+        print(f"✅ Removed {len(removed)} {noun} from your itinerary!")
+        return len(removed)
     
     def update_destination(self, city: str) -> bool:
         """Update details of an existing destination."""
-        for dest in self.destinations:
-            if dest.city.lower() == city.lower():
-                print(f"Updating {dest.city}, {dest.country}")
-                print("Leave blank to keep current value:")
-                
-                new_country = input(f"Country ({dest.country}): ").strip()
-                if new_country:
-                    dest.country = new_country
-                
-                new_start = input(f"Start Date ({dest.start_date}): ").strip()
-                if new_start and self._validate_date(new_start):
-                    dest.start_date = new_start
-                
-                new_end = input(f"End Date ({dest.end_date}): ").strip()
-                if new_end and self._validate_date(new_end):
-                    dest.end_date = new_end
-                
-                new_budget = input(f"Budget ({dest.budget}): ").strip()
-                if new_budget:
-                    try:
-                        dest.budget = float(new_budget)
-                    except ValueError:
-                        print("❌ Invalid budget format!")
-                
-                new_activities = input(f"Activities (comma-separated): ").strip()
-                if new_activities:
-                    dest.activities = [act.strip() for act in new_activities.split(',')]
-                
-                print(f"✅ Updated {dest.city}!")
-                return True
+        dest = self._find_by_city(city)
+        if dest is None:
+            print(f"❌ Destination '{city}' not found!")
+            return False
         
-        print(f"❌ Destination '{city}' not found!")
-        return False
+        old_key = self._sort_key(dest) if self._sort_key else None
+        print(f"Updating {dest.city}, {dest.country}")
+        print("Leave blank to keep current value:")
+        
+        new_country = input(f"Country ({dest.country}): ").strip()
+        if new_country:
+            dest.update_details(country=new_country)
+        
+        new_start = input(f"Start Date ({dest.start_date}): ").strip()
+        if new_start and self._validate_date(new_start):
+            dest.update_details(start_date=new_start)
+        
+        new_end = input(f"End Date ({dest.end_date}): ").strip()
+        if new_end and self._validate_date(new_end):
+            dest.update_details(end_date=new_end)
+        
+        new_budget = input(f"Budget ({dest.budget}): ").strip()
+        if new_budget:
+            try:
+                dest.update_details(budget=float(new_budget))
+            except ValueError:
+                print("❌ Invalid budget format!")
+        
+        new_activities = input(f"Activities (comma-separated): ").strip()
+        if new_activities:
+            dest.update_details(activities=[act.strip() for act in new_activities.split(',')])
+        
+        if self._sort_key and self._sort_key(dest) != old_key:
+            # Move just this destination back into sorted position
+            self.destinations.remove(dest)
+            self._by_city[dest.city.lower()].remove(dest)
+            self._insert(dest)
+        
+        print(f"✅ Updated {dest.city}!")
+        return True
     
     def search_destination(self, query: str) -> List[Destination]:
         """Search destinations by city, country, or activities."""
-        results = []
         query_lower = query.lower()
-        
-        for dest in self.destinations:
-            if (query_lower in dest.city.lower() or 
-                query_lower in dest.country.lower() or
-                any(query_lower in activity.lower() for activity in dest.activities)):
-                results.append(dest)
-        
-        return results
+        return [dest for dest in self.destinations if query_lower in dest.search_blob]
     
     def view_all_destinations(self):
         
@@ -138,21 +500,58 @@ class ItineraryManager:
             print("📭 No destinations in your itinerary yet!")
             return
         
-        print(f"\n🗺️  YOUR TRAVEL ITINERARY ({len(self.destinations)} destinations)")
-        print("=" * 60)
-        
-        for i, dest in enumerate(self.destinations, 1):
-            print(f"{i}. {dest}")
+        # Build the whole listing first and write it once instead of printing per destination
+        lines = [f"\n🗺️  YOUR TRAVEL ITINERARY ({len(self.destinations)} destinations)", "=" * 60]
+        lines.extend(f"{i}. {dest}" for i, dest in enumerate(self.destinations, 1))
+        sys.stdout.write("\n".join(lines) + "\n")
     
-    def save_to_file(self):
-       
+    def save_to_file(self, pretty: bool = False):
+        """Save the itinerary atomically; pass pretty=True for an indented file."""
         try:
-            data = [dest.to_dict() for dest in self.destinations]
-            with open(self.filename, 'w') as f:
-                json.dump(data, f, indent=2)
+            _atomic_write(self.filename, self._encode_destinations(pretty))
             print(f"✅ Itinerary saved to {self.filename}")
         except Exception as e:
             print(f"❌ Error saving file: {e}")
+            return
+        
+        if msgpack is not None:
+            try:
+                # Written after the JSON file so a fresh copy is never older than it
+                _atomic_write(self.msgpack_filename, self._pack_destinations())
+            except Exception as e:
+                print(f"⚠️  Warning: Could not save {self.msgpack_filename}: {e}")
+    
+    def _encode_destinations(self, pretty: bool) -> Iterator[bytes]:
+        """Yield the itinerary as JSON, one destination per line unless pretty."""
+        if pretty:
+            # orjson encodes the dataclasses directly; stdlib json converts each
+            # destination through to_dict as it reaches it
+            yield _json_dumps(self.destinations, pretty=True, default=Destination.to_dict)
+            return
+        
+        # Encode one destination at a time instead of building the whole list
+        yield b"["
+        for i, dest in enumerate(self.destinations):
+            yield b",\n" if i else b"\n"
+            yield _json_dumps(dest, default=Destination.to_dict)
+        yield b"\n]\n"
+    
+    def _pack_destinations(self) -> Iterator[bytes]:
+        """Yield the itinerary as a MessagePack array, one destination at a time."""
+        packer = msgpack.Packer()
+        yield packer.pack_array_header(len(self.destinations))
+        for dest in self.destinations:
+            yield packer.pack(dest.to_dict())
+    
+    def _read_destination_data(self) -> list:
+        """Read raw destination dicts, preferring an up-to-date msgpack copy."""
+        if (msgpack is not None and os.path.exists(self.msgpack_filename) and
+                os.path.getmtime(self.msgpack_filename) >= os.path.getmtime(self.filename)):
+            try:
+                return _parse_file(self.msgpack_filename, msgpack.unpackb)
+            except Exception:
+                pass  # Fall back to the JSON file, which is always authoritative
+        return _load_json_file(self.filename)
     
     def load_from_file(self):
         
@@ -160,38 +559,52 @@ class ItineraryManager:
             return
         
         try:
-            with open(self.filename, 'r') as f:
-                data = json.load(f)
+            data = self._read_destination_data()
             
             self.destinations = [Destination.from_dict(item) for item in data]
+            self._rebuild_index()
+            self._sort_key = None
             print(f"✅ Loaded {len(self.destinations)} destinations from {self.filename}")
         except Exception as e:
             print(f"❌ Error loading file: {e}")
     
     def _validate_date(self, date_str: str) -> bool:
         
-        try:
-            datetime.strptime(date_str, '%Y-%m-%d')
+        if is_iso_date(date_str):
             return True
-        except ValueError:
-            print("❌ Invalid date format! Use YYYY-MM-DD")
-            return False
+        print("❌ Invalid date format! Use YYYY-MM-DD")
+        return False
+    
+    def _sort_by(self, key: Callable[[Destination], object]):
+        """Sort by key unless already sorted by it; later adds keep the order."""
+        if self._sort_key is not key:
+            self.destinations.sort(key=key)
+            self._rebuild_index()
+            self._sort_key = key
     
     def sort_by_date(self):
         
-        self.destinations.sort(key=lambda x: x.start_date)
+        self._sort_by(BY_START_DATE)
         print("✅ Destinations sorted by start date!")
     
     def sort_by_budget(self):
         
-        self.destinations.sort(key=lambda x: x.budget)
+        self._sort_by(BY_BUDGET)
         print("✅ Destinations sorted by budget!")
 
 
 class AITravelAssistant:
     """AI-powered travel assistant using OpenAI API."""
     
-    def __init__(self, api_key: str = None):
+    # Most recent responses kept in memory and on disk
+    CACHE_SIZE = 128
+    
+    def __init__(self, api_key: str = None, cache_file: str = "ai_cache.json"):
+        # Responses are cached by a hash of the full request so repeats skip the API
+        self.cache_file = cache_file
+        self._cache: "OrderedDict[str, str]" = self._load_cache()
+        self._cache_dirty = False
+        
         # Multiple ways to get the API key
         if api_key:
             self.api_key = api_key
@@ -213,9 +626,8 @@ class AITravelAssistant:
             self.client = None
         else:
             try:
-                self.client = openai.OpenAI(api_key=self.api_key)
-                # Test the API key with a simple request
-                self._test_api_key()
+                # The key is validated lazily by the first real request
+                self.client = openai.OpenAI(api_key=self.api_key, http_client=SHARED_HTTPX)
             except Exception as e:
                 print(f"❌ Error initializing OpenAI client: {e}")
                 self.client = None
@@ -240,172 +652,421 @@ class AITravelAssistant:
         """Check if AI features are available."""
         return self.client is not None
     
+    def _build_request(self, destination: Destination, kind: str) -> dict:
+        """Build the chat completion request body for an itinerary or budget tips."""
+        if kind == "itinerary":
+            system = "You are a helpful travel planning assistant."
+            max_tokens = self._itinerary_max_tokens(destination)
+            template = ITINERARY_PROMPT
+        elif kind == "budget":
+            system = "You are a budget travel expert."
+            max_tokens = 1000
+            template = BUDGET_TIPS_PROMPT
+        else:
+            raise ValueError(f"Unknown AI request kind: {kind}")
+        
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": template.format_map(destination.prompt_fields())}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.7
+        }
+    
+    @staticmethod
+    def _itinerary_max_tokens(destination: Destination) -> int:
+        """Scale the output token limit with the trip length, up to 1500 tokens."""
+        try:
+            days = max(destination.num_days, 1)
+        except ValueError:
+            # Malformed dates (e.g. a hand-edited file) keep the full limit
+            return 1500
+        return min(1500, 200 + 180 * days)
+    
+    def _load_cache(self) -> "OrderedDict[str, str]":
+        """Load previously cached AI responses from disk, oldest first."""
+        if not os.path.exists(self.cache_file):
+            return OrderedDict()
+        
+        try:
+            cache = OrderedDict(_load_json_file(self.cache_file))
+        except Exception as e:
+            print(f"⚠️  Warning: Could not load AI cache: {e}")
+            return OrderedDict()
+        
+        while len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
+        return cache
+    
+    def save_cache(self):
+        """Write cached AI responses to disk if anything new was cached."""
+        if not self._cache_dirty:
+            return
+        
+        try:
+            # Copy into a plain dict so the file keeps least-recently-used order
+            _atomic_write(self.cache_file, [_json_dumps(dict(self._cache))])
+            self._cache_dirty = False
+        except Exception as e:
+            print(f"❌ Error saving AI cache: {e}")
+    
+    @staticmethod
+    def _cache_key(request: dict) -> str:
+        """Hash the model, messages and sampling settings of a request.
+        
+        Editing a prompt template or switching models changes the key, so stale
+        responses are never served.
+        """
+        return hashlib.sha256(_json_dumps(request)).hexdigest()
+    
+    def _cached(self, key: str) -> Optional[str]:
+        """Return a cached response and mark it as recently used."""
+        content = self._cache.get(key)
+        if content is not None:
+            self._cache.move_to_end(key)
+        return content
+    
+    def _remember(self, key: str, content: Optional[str]):
+        """Cache a successful response, evicting the least recently used one if full."""
+        if content:
+            self._cache[key] = content
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+            self._cache_dirty = True
+    
     def generate_itinerary(self, destination: Destination) -> str:
+        return "".join(self.stream_itinerary(destination))
+    
+    def generate_budget_tips(self, destination: Destination) -> str:
+        return "".join(self.stream_budget_tips(destination))
+    
+    def generate_both(self, destination: Destination) -> Tuple[str, str]:
+        """Generate the itinerary and budget tips at the same time.
+        
+        The two requests overlap, so the wait is roughly the slower of the two
+        rather than their sum.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            itinerary = executor.submit(self.generate_itinerary, destination)
+            tips = executor.submit(self.generate_budget_tips, destination)
+            return itinerary.result(), tips.result()
+    
+    def stream_itinerary(self, destination: Destination) -> Iterator[str]:
+        """Yield the itinerary piece by piece as OpenAI produces it."""
+        if not self.is_available():
+            yield self._generate_fallback_itinerary(destination)
+            return
+        yield from self._stream(destination, "itinerary")
+    
+    def stream_budget_tips(self, destination: Destination) -> Iterator[str]:
+        """Yield budget tips piece by piece as OpenAI produces them."""
         if not self.is_available():
-            return self._generate_fallback_itinerary(destination)
+            yield self._generate_fallback_budget_tips(destination)
+            return
+        yield from self._stream(destination, "budget")
+    
+    def _stream(self, destination: Destination, kind: str) -> Iterator[str]:
+        """Yield a cached response, or stream a new one from OpenAI and cache it."""
+        request = self._build_request(destination, kind)
+        key = self._cache_key(request)
+        cached = self._cached(key)
+        if cached is not None:
+            yield cached
+            return
         
+        parts = []
         try:
-            prompt = f"""
-Create a detailed daily travel itinerary for {destination.city}, {destination.country}
-from {destination.start_date} to {destination.end_date}.
-Budget: ${destination.budget} USD.
-Preferred Activities: {', '.join(destination.activities)}.
-
-Please provide:
-1. Day-by-day schedule
-2. Estimated costs for major activities
-3. Restaurant recommendations
-4. Transportation tips
-5. Must-see attractions
-
-Format the response in a clear, organized manner.
-"""
+            stream = self.client.chat.completions.create(
+                **request,
+                stream=True
+            )
             
-            response = self.client.chat.completions.create(
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+        except openai.AuthenticationError:
+            self.client = None
+            yield "❌ Authentication failed. Please check your OpenAI API key."
+            return
+        except openai.RateLimitError:
+            yield "❌ Rate limit exceeded. Please try again later."
+            return
+        except Exception as e:
+            label = "itinerary" if kind == "itinerary" else "budget tips"
+            # Keep the error off the end of a partially streamed response
+            prefix = "\n" if parts else ""
+            yield f"{prefix}❌ Error generating {label}: {e}"
+            return
+        
+        self._remember(key, "".join(parts))
+    
+    def generate_all(self, destinations: List[Destination], kind: str = "itinerary",
+                     max_concurrency: int = 10) -> List[str]:
+        """Generate itineraries or budget tips for many destinations concurrently.
+        
+        Requests are sent in parallel with at most ``max_concurrency`` in flight, so
+        the wait is close to the slowest response instead of the sum of all of them.
+        Results are returned in the same order as ``destinations``.
+        """
+        if not self.is_available():
+            return [self._fallback_for(kind)(dest) for dest in destinations]
+        
+        return asyncio.run(self._generate_all_async(destinations, kind, max_concurrency))
+    
+    async def _generate_all_async(self, destinations: List[Destination], kind: str,
+                                  max_concurrency: int) -> List[str]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        http_client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        # SDK retries are off so _generate_one_async's backoff is the only retry layer
+        async with openai.AsyncOpenAI(api_key=self.api_key, http_client=http_client,
+                                      max_retries=0) as client:
+            return await asyncio.gather(*(
+                self._generate_one_async(client, semaphore, dest, kind)
+                for dest in destinations
+            ))
+    
+    async def _generate_one_async(self, client, semaphore: asyncio.Semaphore,
+                                  destination: Destination, kind: str,
+                                  max_retries: int = 3) -> str:
+        """Run a single request, backing off exponentially when rate limited."""
+        request = self._build_request(destination, kind)
+        key = self._cache_key(request)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                try:
+                    response = await client.chat.completions.create(**request)
+                    content = response.choices[0].message.content
+                    self._remember(key, content)
+                    return content
+                except openai.RateLimitError:
+                    if attempt == max_retries:
+                        return "❌ Rate limit exceeded. Please try again later."
+                    await asyncio.sleep(2 ** attempt)
+                except openai.AuthenticationError:
+                    self.client = None
+                    return "❌ Authentication failed. Please check your OpenAI API key."
+                except Exception as e:
+                    return f"❌ Error generating {destination.city}: {e}"
+    
+    def generate_itineraries_bulk(self, destinations: List[Destination]) -> List[str]:
+        """Generate itineraries for several destinations with a single chat request.
+        
+        The instructions are sent once for all trips instead of once per trip, which
+        saves prompt tokens and round-trips. The whole reply shares one output token
+        limit, so this suits a handful of destinations. Results are returned in the
+        same order as ``destinations``.
+        """
+        if not self.is_available():
+            return [self._generate_fallback_itinerary(dest) for dest in destinations]
+        
+        # Bulk replies come from a different prompt and a shared token limit, so
+        # they are cached apart from single itinerary requests for the same trip
+        keys = [
+            self._cache_key({"bulk_prompt": BULK_ITINERARY_PROMPT, **self._build_request(dest, "itinerary")})
+            for dest in destinations
+        ]
+        results = [self._cached(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        trips = "\n".join(
+            BULK_TRIP_LINE.format_map({"number": n, **destinations[i].prompt_fields()})
+            for n, i in enumerate(pending, 1)
+        )
+        
+        try:
+            # No automatic retries: a timed-out generation is still billed, so
+            # repeating it would only multiply the wait and the cost
+            client = self.client.with_options(timeout=BULK_TIMEOUT, max_retries=0)
+            response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a helpful travel planning assistant."},
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": BULK_ITINERARY_PROMPT.format(trips=trips)}
                 ],
-                max_tokens=1500,
+                response_format={"type": "json_object"},
+                max_tokens=min(4096, sum(self._itinerary_max_tokens(destinations[i]) for i in pending)),
                 temperature=0.7
             )
-            
-            return response.choices[0].message.content
+            itineraries = _json_loads(response.choices[0].message.content)
+            if not isinstance(itineraries, dict):
+                raise ValueError("expected a JSON object keyed by trip number")
             
         except openai.AuthenticationError:
-            return "❌ Authentication failed. Please check your OpenAI API key."
+            self.client = None
+            message = "❌ Authentication failed. Please check your OpenAI API key."
         except openai.RateLimitError:
-            return "❌ Rate limit exceeded. Please try again later."
+            message = "❌ Rate limit exceeded. Please try again later."
         except Exception as e:
-            return f"❌ Error generating itinerary: {e}"
+            message = f"❌ Error generating itineraries: {e}"
+        else:
+            message = None
+        
+        for n, i in enumerate(pending, 1):
+            if message:
+                results[i] = message
+                continue
+            itinerary = itineraries.get(str(n))
+            if not itinerary:
+                results[i] = "❌ No itinerary returned for this destination."
+                continue
+            if not isinstance(itinerary, str):
+                itinerary = _json_dumps(itinerary, pretty=True).decode("utf-8")
+            results[i] = itinerary
+            self._remember(keys[i], itinerary)
+        
+        return results
     
-    def generate_budget_tips(self, destination: Destination) -> str:
+    def batch_generate(self, destinations: List[Destination], kind: str = "itinerary",
+                       poll_interval: float = 10.0) -> List[str]:
+        """Generate itineraries or budget tips for many destinations in one Batch API job.
+        
+        Batch jobs are billed at half price but run asynchronously on OpenAI's side,
+        so this polls until the job finishes. Results are returned in the same order
+        as ``destinations``.
+        """
         if not self.is_available():
-            return self._generate_fallback_budget_tips(destination)
+            return [self._fallback_for(kind)(dest) for dest in destinations]
+        
+        requests = [self._build_request(dest, kind) for dest in destinations]
+        keys = [self._cache_key(request) for request in requests]
+        results = [self._cached(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        lines = [
+            _json_dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": requests[i]
+            })
+            for i in pending
+        ]
+        
+        def fail(message: str) -> List[str]:
+            for i in pending:
+                results[i] = message
+            return results
         
         try:
-            prompt = f"""
-Provide money-saving tips and budget advice for traveling to {destination.city}, {destination.country}.
-Budget: ${destination.budget} USD.
-Activities: {', '.join(destination.activities)}.
-
-Include:
-1. Budget-friendly accommodation options
-2. Cheap local food recommendations
-3. Free or low-cost activities
-4. Transportation savings
-5. General money-saving tips for this destination
-
-Keep it practical and specific to this location.
-"""
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a budget travel expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
+            batch_file = self.client.files.create(
+                file=("batch.jsonl", b"\n".join(lines)),
+                purpose="batch"
             )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            status = None
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                if batch.status != status:
+                    status = batch.status
+                    print(f"⏳ Batch {batch.id}: {status}...")
+                time.sleep(poll_interval)
+                batch = self.client.batches.retrieve(batch.id)
+            
+            if batch.status == "failed":
+                return fail("❌ Batch job failed.")
             
-            return response.choices[0].message.content
+            # Expired and cancelled jobs still deliver the requests that finished
+            # (and are billed for them); failed requests land in the error file
+            # with the same line format
+            records = []
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    records.extend(self.client.files.content(file_id).text.splitlines())
             
         except openai.AuthenticationError:
-            return "❌ Authentication failed. Please check your OpenAI API key."
+            self.client = None
+            return fail("❌ Authentication failed. Please check your OpenAI API key.")
         except openai.RateLimitError:
-            return "❌ Rate limit exceeded. Please try again later."
+            return fail("❌ Rate limit exceeded. Please try again later.")
         except Exception as e:
-            return f"❌ Error generating budget tips: {e}"
+            return fail(f"❌ Error running batch job: {e}")
+        
+        if batch.status == "completed":
+            fail("❌ No result returned for this destination.")
+        else:
+            fail(f"❌ Batch job {batch.status} before this request finished.")
+        for line in records:
+            if not line.strip():
+                continue
+            record = _json_loads(line)
+            index = int(record["custom_id"])
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+            if response.get("status_code") == 200:
+                results[index] = body["choices"][0]["message"]["content"]
+                self._remember(keys[index], results[index])
+            else:
+                error = record.get("error") or body.get("error") or {}
+                results[index] = f"❌ Request failed: {error.get('message', 'unknown error')}"
+        
+        return results
+    
+    def _fallback_for(self, kind: str):
+        """Return the offline generator used for the given request kind."""
+        if kind == "itinerary":
+            return self._generate_fallback_itinerary
+        return self._generate_fallback_budget_tips
     
     def _generate_fallback_itinerary(self, destination: Destination) -> str:
         """Generate a basic itinerary without AI when API is not available."""
-        days = (datetime.strptime(destination.end_date, '%Y-%m-%d') - 
-                datetime.strptime(destination.start_date, '%Y-%m-%d')).days + 1
-        
-        itinerary = f"""
-🚫 AI Features Unavailable - Basic Itinerary Template
-
-📍 {destination.city}, {destination.country}
-📅 {destination.start_date} to {destination.end_date} ({days} days)
-💰 Budget: ${destination.budget}
-🎯 Activities: {', '.join(destination.activities)}
-
-📋 SUGGESTED DAILY STRUCTURE:
-{'='*40}
-
-Day 1: Arrival & City Orientation
-- Check into accommodation
-- Explore nearby area
-- Local restaurant for dinner
-
-Day 2-{days-1}: Main Activities
-- Morning: {destination.activities[0] if destination.activities else 'Sightseeing'}
-- Afternoon: {destination.activities[1] if len(destination.activities) > 1 else 'Local exploration'}
-- Evening: Local cuisine and culture
-
-Day {days}: Departure
-- Last-minute shopping/activities
-- Check out and travel home
-
-💡 GENERAL TIPS:
-- Research local transportation options
-- Book accommodations in advance
-- Try local street food
-- Visit tourist information centers
-- Keep emergency contacts handy
-
-⚠️  For detailed, personalized itineraries, please set up your OpenAI API key.
-"""
-        return itinerary
+        days = destination.num_days
+        activities = destination.activities
+        return FALLBACK_ITINERARY.format_map({
+            **destination.prompt_fields(),
+            "days": days,
+            "last_full_day": days - 1,
+            "morning": activities[0] if activities else "Sightseeing",
+            "afternoon": activities[1] if len(activities) > 1 else "Local exploration"
+        })
     
     def _generate_fallback_budget_tips(self, destination: Destination) -> str:
         """Generate basic budget tips without AI."""
-        return f"""
-🚫 AI Features Unavailable - General Budget Tips
-
-💰 BUDGET TIPS FOR {destination.city.upper()}
-{'='*40}
-
-🏠 ACCOMMODATION:
-- Consider hostels or budget hotels
-- Look for accommodations outside city center
-- Book in advance for better rates
-- Check for group discounts
-
-🍽️ FOOD & DINING:
-- Eat at local markets and street food stalls
-- Cook meals if accommodation has kitchen
-- Look for lunch specials and happy hours
-- Avoid touristy restaurant areas
-
-🚌 TRANSPORTATION:
-- Use public transport instead of taxis
-- Walk or rent bicycles when possible
-- Look for day passes or tourist cards
-- Book flights/trains in advance
-
-🎯 ACTIVITIES:
-- Look for free walking tours
-- Visit free museums on designated days
-- Enjoy parks and natural attractions
-- Check for student/senior discounts
-
-💡 GENERAL MONEY-SAVING TIPS:
-- Set a daily spending limit
-- Use budget tracking apps
-- Avoid currency exchange at airports
-- Negotiate prices at local markets
-- Travel during off-peak seasons
-
-⚠️  For location-specific budget advice, please set up your OpenAI API key.
-"""
+        return FALLBACK_BUDGET_TIPS.format_map({"city_upper": destination.city.upper()})
 
 
 class TravelPlannerApp:
     """Main application class for the travel planner."""
     
+    # Built once; only the AI status line changes between draws
+    _MENU = "\n".join([
+        "",
+        "=" * 50,
+        "🌍 AI TRAVEL ITINERARY PLANNER",
+        "AI Status: {ai_status}",
+        "=" * 50,
+        "1. Add Destination",
+        "2. Remove Destination",
+        "3. Update Destination",
+        "4. View All Destinations",
+        "5. Search Destination",
+        "6. AI Travel Assistance",
+        "7. Save Itinerary",
+        "8. Load Itinerary",
+        "9. Sort Destinations",
+        "10. Setup API Key",
+        "11. Exit",
+        "=" * 50,
+        "",
+    ])
+    
     def __init__(self):
         self.manager = ItineraryManager()
         self.ai_assistant = AITravelAssistant()
@@ -420,23 +1081,7 @@ class TravelPlannerApp:
     
     def display_menu(self):
         ai_status = "🤖 Available" if self.ai_assistant.is_available() else "🚫 Disabled"
-        
-        print("\n" + "="*50)
-        print("🌍 AI TRAVEL ITINERARY PLANNER")
-        print(f"AI Status: {ai_status}")
-        print("="*50)
-        print("1. Add Destination")
-        print("2. Remove Destination") 
-        print("3. Update Destination")
-        print("4. View All Destinations")
-        print("5. Search Destination")
-        print("6. AI Travel Assistance")
-        print("7. Save Itinerary")
-        print("8. Load Itinerary")
-        print("9. Sort Destinations")
-        print("10. Setup API Key")
-        print("11. Exit")
-        print("="*50)
+        sys.stdout.write(self._MENU.format(ai_status=ai_status))
     
     def setup_api_key(self):
         """Allow user to set up API key during runtime."""
@@ -447,8 +1092,14 @@ class TravelPlannerApp:
         api_key = input("Enter your OpenAI API key (or press Enter to skip): ").strip()
         
         if api_key:
+            # Persist cached responses so the new assistant picks them up
+            self.ai_assistant.save_cache()
             # Test the new API key
             test_assistant = AITravelAssistant(api_key)
+            # A key typed in by hand is checked now rather than on first use
+            if test_assistant.is_available():
+                test_assistant._test_api_key()
+            
             if test_assistant.is_available():
                 self.ai_assistant = test_assistant
                 print("✅ API key set successfully! AI features are now available.")
@@ -473,22 +1124,18 @@ class TravelPlannerApp:
         
         while True:
             start_date = input("Start Date (YYYY-MM-DD): ").strip()
-            try:
-                datetime.strptime(start_date, '%Y-%m-%d')
+            if is_iso_date(start_date):
                 break
-            except ValueError:
-                print("❌ Invalid date format! Use YYYY-MM-DD")
+            print("❌ Invalid date format! Use YYYY-MM-DD")
         
         while True:
             end_date = input("End Date (YYYY-MM-DD): ").strip()
-            try:
-                datetime.strptime(end_date, '%Y-%m-%d')
-                if end_date >= start_date:
-                    break
-                else:
-                    print("❌ End date must be after start date!")
-            except ValueError:
+            if not is_iso_date(end_date):
                 print("❌ Invalid date format! Use YYYY-MM-DD")
+            elif end_date >= start_date:
+                break
+            else:
+                print("❌ End date must be after start date!")
         
         while True:
             try:
@@ -523,30 +1170,44 @@ class TravelPlannerApp:
         print("Available destinations:")
         for i, dest in enumerate(self.manager.destinations, 1):
             print(f"{i}. {dest.city}, {dest.country}")
+        print("A. Generate for all destinations")
         
         try:
-            choice = int(input("\nSelect destination number: ")) - 1
+            selection = input("\nSelect destination number: ").strip()
+            if selection.lower() == "a":
+                self.generate_for_all_menu()
+                return
+            
+            choice = int(selection) - 1
             if 0 <= choice < len(self.manager.destinations):
                 destination = self.manager.destinations[choice]
                 
                 print("\nAI Assistance Options:")
                 print("1. Generate Daily Itinerary")
                 print("2. Get Budget Tips")
+                print("3. Both")
                 
-                ai_choice = input("Choose option (1-2): ").strip()
+                ai_choice = input("Choose option (1-3): ").strip()
                 
                 if ai_choice == "1":
                     print(f"\n🗓️ Generating itinerary for {destination.city}...")
-                    print("⏳ This may take a moment...")
-                    itinerary = self.ai_assistant.generate_itinerary(destination)
                     print(f"\n📋 DAILY ITINERARY FOR {destination.city.upper()}")
                     print("=" * 60)
-                    print(itinerary)
+                    self._print_stream(self.ai_assistant.stream_itinerary(destination))
                     
                 elif ai_choice == "2":
                     print(f"\n💰 Generating budget tips for {destination.city}...")
+                    print(f"\n💡 BUDGET TIPS FOR {destination.city.upper()}")
+                    print("=" * 60)
+                    self._print_stream(self.ai_assistant.stream_budget_tips(destination))
+                    
+                elif ai_choice == "3":
+                    print(f"\n🧭 Generating itinerary and budget tips for {destination.city}...")
                     print("⏳ This may take a moment...")
-                    tips = self.ai_assistant.generate_budget_tips(destination)
+                    itinerary, tips = self.ai_assistant.generate_both(destination)
+                    print(f"\n📋 DAILY ITINERARY FOR {destination.city.upper()}")
+                    print("=" * 60)
+                    print(itinerary)
                     print(f"\n💡 BUDGET TIPS FOR {destination.city.upper()}")
                     print("=" * 60)
                     print(tips)
@@ -559,6 +1220,62 @@ class TravelPlannerApp:
         except ValueError:
             print("❌ Invalid input!")
     
+    @staticmethod
+    def _print_stream(chunks: Iterator[str]):
+        """Print text as it arrives instead of waiting for the full response."""
+        for chunk in chunks:
+            print(chunk, end="", flush=True)
+        print()
+    
+    def generate_for_all_menu(self):
+        """Generate itineraries or budget tips for every destination in one go."""
+        destinations = self.manager.destinations
+        
+        print("\nAI Assistance Options:")
+        print("1. Generate Daily Itineraries")
+        print("2. Get Budget Tips")
+        
+        ai_choice = input("Choose option (1-2): ").strip()
+        if ai_choice == "1":
+            kind, title = "itinerary", "📋 DAILY ITINERARY FOR"
+        elif ai_choice == "2":
+            kind, title = "budget", "💡 BUDGET TIPS FOR"
+        else:
+            print("❌ Invalid option!")
+            return
+        
+        print("\nHow should they be generated?")
+        print("1. Now (parallel requests)")
+        print("2. Batch API (50% cheaper, can take several minutes)")
+        if kind == "itinerary":
+            print("3. One combined request (fewest tokens, best for a few destinations)")
+        
+        mode = input("Choose option: ").strip()
+        if mode == "3" and kind == "itinerary":
+            print(f"\n🧳 Generating {len(destinations)} itineraries in one request...")
+            print("⏳ This may take a moment...")
+            results = self.ai_assistant.generate_itineraries_bulk(destinations)
+        elif mode == "1":
+            print(f"\n⚡ Generating for {len(destinations)} destinations in parallel...")
+            print("⏳ This may take a moment...")
+            results = self.ai_assistant.generate_all(destinations, kind)
+        elif mode == "2":
+            print(f"\n📦 Submitting batch job for {len(destinations)} destinations...")
+            print("⏳ Press Ctrl+C to stop waiting...")
+            try:
+                results = self.ai_assistant.batch_generate(destinations, kind)
+            except KeyboardInterrupt:
+                print("\n⏹️  Stopped waiting. The batch job keeps running on OpenAI's side.")
+                return
+        else:
+            print("❌ Invalid option!")
+            return
+        
+        for destination, result in zip(destinations, results):
+            print(f"\n{title} {destination.city.upper()}")
+            print("=" * 60)
+            print(result)
+    
     def sort_menu(self):
         if not self.manager.destinations:
             print("❌ No destinations to sort!")
@@ -578,68 +1295,93 @@ class TravelPlannerApp:
         else:
             print("❌ Invalid option!")
     
+    def add_destination_menu(self):
+        destination = self.get_destination_input()
+        if destination:
+            self.manager.add_destination(destination)
+    
+    def remove_destination_menu(self):
+        entry = input("Enter city name to remove (separate several with commas; "
+                      "removes the first trip to each): ").strip()
+        if not entry:
+            return
+        
+        # City names may contain commas (e.g. "Washington, D.C."), so an exact
+        # match on the whole entry wins over splitting it
+        if self.manager.has_destination(entry) or ',' not in entry:
+            self.manager.remove_destination(entry)
+            return
+        
+        cities = [city.strip() for city in entry.split(',') if city.strip()]
+        if cities:
+            self.manager.remove_many(cities)
+    
+    def update_destination_menu(self):
+        city = input("Enter city name to update: ").strip()
+        if city:
+            self.manager.update_destination(city)
+    
+    def search_menu(self):
+        query = input("Enter search term (city/country/activity): ").strip()
+        if query:
+            results = self.manager.search_destination(query)
+            if results:
+                print(f"\n🔍 SEARCH RESULTS ({len(results)} found)")
+                print("=" * 40)
+                for dest in results:
+                    print(dest)
+            else:
+                print("❌ No destinations found!")
+    
+    def save_all(self):
+        """Save the itinerary along with any newly cached AI responses."""
+        self.manager.save_to_file()
+        self.ai_assistant.save_cache()
+    
+    def exit_app(self) -> bool:
+        """Save everything before quitting; returning True stops the main loop."""
+        self.save_all()
+        print("👋 Thank you for using AI Travel Itinerary Planner!")
+        print("🌟 Safe travels!")
+        return True
+    
     def run(self):
         print("🌍 Welcome to AI Travel Itinerary Planner!")
         
+        actions: Dict[str, Callable[[], Optional[bool]]] = {
+            "1": self.add_destination_menu,
+            "2": self.remove_destination_menu,
+            "3": self.update_destination_menu,
+            "4": self.manager.view_all_destinations,
+            "5": self.search_menu,
+            "6": self.ai_assistance_menu,
+            "7": self.save_all,
+            "8": self.manager.load_from_file,
+            "9": self.sort_menu,
+            "10": self.setup_api_key,
+            "11": self.exit_app,
+        }
+        # Only pause between actions for a person at a terminal, so the planner
+        # can also be driven by piping commands into stdin
+        interactive = sys.stdin.isatty()
+        
         while True:
             self.display_menu()
-            choice = input("\nEnter your choice (1-11): ").strip()
-            
-            if choice == "1":
-                destination = self.get_destination_input()
-                if destination:
-                    self.manager.add_destination(destination)
-            
-            elif choice == "2":
-                city = input("Enter city name to remove: ").strip()
-                if city:
-                    self.manager.remove_destination(city)
-            
-            elif choice == "3":
-                city = input("Enter city name to update: ").strip()
-                if city:
-                    self.manager.update_destination(city)
-            
-            elif choice == "4":
-                self.manager.view_all_destinations()
-            
-            elif choice == "5":
-                query = input("Enter search term (city/country/activity): ").strip()
-                if query:
-                    results = self.manager.search_destination(query)
-                    if results:
-                        print(f"\n🔍 SEARCH RESULTS ({len(results)} found)")
-                        print("=" * 40)
-                        for dest in results:
-                            print(dest)
-                    else:
-                        print("❌ No destinations found!")
-            
-            elif choice == "6":
-                self.ai_assistance_menu()
-            
-            elif choice == "7":
-                self.manager.save_to_file()
-            
-            elif choice == "8":
-                self.manager.load_from_file()
-            
-            elif choice == "9":
-                self.sort_menu()
-            
-            elif choice == "10":
-                self.setup_api_key()
-            
-            elif choice == "11":
-                self.manager.save_to_file()
-                print("👋 Thank you for using AI Travel Itinerary Planner!")
-                print("🌟 Safe travels!")
+            try:
+                choice = input("\nEnter your choice (1-11): ").strip()
+                action = actions.get(choice)
+                if action is None:
+                    print("❌ Invalid choice! Please enter 1-11.")
+                elif action():
+                    break
+                
+                if interactive:
+                    input("\nPress Enter to continue...")
+            except EOFError:
+                # End of piped input behaves like choosing Exit
+                print()
+                self.exit_app()
                 break
-            
-            else:
-                print("❌ Invalid choice! Please enter 1-11.")
-            
-            input("\nPress Enter to continue...")
 
 
 if __name__ == "__main__":